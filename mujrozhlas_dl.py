@@ -1,21 +1,49 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
+import math
+import os
 import re
 import shutil
+import socket
 import subprocess
+import sys
 import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from urllib.parse import urlparse, urlsplit, urlunsplit, unquote
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, unquote
+from xml.etree import ElementTree as ET
 
 import requests
-from playwright.sync_api import sync_playwright
+from requests.adapters import HTTPAdapter
+from urllib3.util import connection as urllib3_connection
+from urllib3.util.retry import Retry
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, sync_playwright
 
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0"
 CRO_HOST_RE = re.compile(r"(^|\.)croaod\.cz$", re.I)
 MPD_RE = re.compile(r"\.mpd(\?|$)", re.I)
 MP3_RE = re.compile(r"\.mp3(\?|$)", re.I)
 M4S_RE = re.compile(r"\.m4s(\?|$)", re.I)
+STREAM_RE = re.compile(r"\.(mpd|mp3|m4s)(\?|$)", re.I)
+# Absolute croaod.cz stream URLs embedded in page HTML/JSON (player config, JSON-LD)
+PAGE_STREAM_RE = re.compile(r"https?://[\w.-]*croaod\.cz/[^\s\"'<>]+?\.(?:mpd|mp3|m4s)(?:\?[^\s\"'<>]*)?", re.I)
+ISO_DURATION_RE = re.compile(r"P(?:(\d+(?:\.\d+)?)D)?(?:T(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?)?$")
+TEMPLATE_VAR_RE = re.compile(r"\$(RepresentationID|Number|Time|Bandwidth)(%0\d+d)?\$")
+
+# Serializes console output when several parts are processed concurrently
+PRINT_LOCK = threading.Lock()
+
+# The same URLs get parsed repeatedly (sniffer events, filename/host lookups)
+_parse_url = lru_cache(maxsize=1024)(urlparse)
+
+MP3_CODECS = {"mp3", "mp4a.6b", "mp4a.69", "mp4a.40.34"}
 
 HEADERS = {
     "User-Agent": UA,
@@ -27,6 +55,56 @@ HEADERS = {
     "Cache-Control": "no-cache",
 }
 
+# Shared session so parts from the same CDN reuse TCP/TLS connections across worker threads.
+# pool_block makes threads beyond HTTP_POOL_SIZE (segment fetchers of parallel parts, MP3 downloads)
+# wait for a free connection instead of opening extra ones that urllib3 would then discard.
+HTTP_POOL_SIZE = 8
+SEGMENT_WORKERS = HTTP_POOL_SIZE
+# Max segments fetched ahead of the one being written
+SEGMENT_WINDOW = 2 * SEGMENT_WORKERS
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE,
+    pool_maxsize=HTTP_POOL_SIZE,
+    pool_block=True,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Resolve each croaod.cz host once per run; parallel workers opening extra connections reuse the addresses.
+# Only the socket address is swapped, so TLS SNI/certificate checks still use the hostname.
+_dns_cache: dict[tuple[str, int], list[tuple]] = {}
+_dns_lock = threading.Lock()
+_urllib3_create_connection = urllib3_connection.create_connection
+
+def _pinned_create_connection(address, *args, **kwargs):
+    host, port = address
+    if not host or not CRO_HOST_RE.search(host):
+        return _urllib3_create_connection(address, *args, **kwargs)
+    key = (host, port)
+    with _dns_lock:
+        infos = _dns_cache.get(key)
+        if infos is None:
+            # Same address family filter urllib3 applies (no IPv6 when the host has none)
+            infos = socket.getaddrinfo(host, port, urllib3_connection.allowed_gai_family(), socket.SOCK_STREAM)
+            _dns_cache[key] = infos
+    err = None
+    for *_, sockaddr in infos:
+        try:
+            return _urllib3_create_connection((sockaddr[0], port), *args, **kwargs)
+        except OSError as e:
+            err = e
+            # Re-resolve on the next attempt (e.g. a Retry) rather than keep hitting a dead address
+            with _dns_lock:
+                _dns_cache.pop(key, None)
+    if err is not None:
+        raise err
+    raise OSError(f"getaddrinfo returned no addresses for {host}")
+
+urllib3_connection.create_connection = _pinned_create_connection
+
 COOKIE_SELECTORS = [
     "#onetrust-accept-btn-handler",
     "button#onetrust-accept-btn-handler",
@@ -52,6 +130,25 @@ PLAY_SELECTORS = [
     "button[title*='Play']",
 ]
 
+# Playwright treats comma-separated selectors as CSS "OR", so one locator call covers the whole list
+COOKIE_SELECTOR = ", ".join(COOKIE_SELECTORS)
+PLAY_SELECTOR = ", ".join(PLAY_SELECTORS)
+STREAM_WAIT_MS = 3000
+# Scrolls until the page stops growing, all inside the browser (no Python round-trip per step).
+# Stops early once the page has fetched a croaod.cz manifest/MP3.
+SCROLL_TO_BOTTOM_JS = r"""async () => {
+    const hit = () => performance.getEntriesByType("resource")
+        .some(e => /croaod\.cz\/[^?#]*\.(mpd|mp3)(\?|#|$)/i.test(e.name));
+    while (!hit()) {
+        const h = document.body.scrollHeight;
+        window.scrollTo(0, h);
+        await new Promise(r => setTimeout(r, 800));
+        if (document.body.scrollHeight === h) return;
+    }
+}"""
+# Subresources not needed to discover stream URLs; croaod.cz traffic is always let through
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
 def segment_to_manifest_url(seg_url: str) -> str | None:
     """
     Convert croaod.cz segment ..._mpd.m4s URL to its manifest.mpd.
@@ -66,7 +163,7 @@ def segment_to_manifest_url(seg_url: str) -> str | None:
     return None
 
 def filename_from_url(url: str) -> str:
-    path = urlparse(url).path or ""
+    path = _parse_url(url).path or ""
     seg = next((s for s in reversed(path.split("/")) if s), "mujrozhlas")
     seg = unquote(seg) or "mujrozhlas"
     return f"{seg}.mp3"
@@ -78,8 +175,168 @@ def die(msg: str, code: int = 2):
     print(f"Error: {msg}")
     raise SystemExit(code)
 
-def record_dash_to_mp3(mpd_url: str, out_path: Path, referer: str):
-    ffmpeg_headers = (
+def parse_iso_duration(value: str) -> float:
+    m = ISO_DURATION_RE.match(value or "")
+    if not m:
+        raise ValueError(f"unsupported duration: {value!r}")
+    d, h, mi, sec = (float(g) if g else 0.0 for g in m.groups())
+    return d * 86400 + h * 3600 + mi * 60 + sec
+
+def _fill_template(template: str, rep_id: str, bandwidth: str, number=None, t=None) -> str:
+    def sub(m):
+        name, fmt = m.group(1), m.group(2)
+        if name == "RepresentationID":
+            return rep_id
+        if name == "Bandwidth":
+            value = int(bandwidth)
+        elif name == "Number":
+            value = number
+        else:
+            value = t
+        if value is None:
+            raise ValueError(f"${name}$ is not available in this template: {template!r}")
+        return (fmt % value) if fmt else str(value)
+    return TEMPLATE_VAR_RE.sub(sub, template).replace("$$", "$")
+
+def dash_segment_urls(mpd_url: str, referer: str) -> tuple[list[str], str]:
+    """
+    Parse a static MPD and return ([init, seg1, seg2, …], codecs) for its best audio representation.
+    Only SegmentTemplate manifests (with or without SegmentTimeline) are supported;
+    raises ValueError otherwise.
+    """
+    r = SESSION.get(mpd_url, headers={"Referer": referer}, timeout=30)
+    r.raise_for_status()
+    root = ET.fromstring(r.content)
+    ns = {"d": root.tag[1:].split("}")[0]} if root.tag.startswith("{") else {"d": ""}
+    q = (lambda tag: f"d:{tag}") if ns["d"] else (lambda tag: tag)
+    if root.get("type", "static") != "static":
+        raise ValueError("live manifests are not supported")
+
+    def base_of(elem, base):
+        b = elem.find(q("BaseURL"), ns)
+        return urljoin(base, b.text.strip()) if b is not None and b.text else base
+
+    base = base_of(root, mpd_url)
+    periods = root.findall(q("Period"), ns)
+    if not periods:
+        raise ValueError("manifest has no Period")
+    if len(periods) > 1:
+        raise ValueError("multi-period manifests are not supported")
+    period = periods[0]
+    base = base_of(period, base)
+
+    best = None
+    for aset in period.findall(q("AdaptationSet"), ns):
+        for rep in aset.findall(q("Representation"), ns):
+            mime = rep.get("mimeType") or aset.get("mimeType") or ""
+            if aset.get("contentType") != "audio" and not mime.startswith("audio/"):
+                continue
+            if best is None or int(rep.get("bandwidth") or 0) > int(best[1].get("bandwidth") or 0):
+                best = (aset, rep)
+    if best is None:
+        raise ValueError("no audio representation in manifest")
+    aset, rep = best
+    base = base_of(rep, base_of(aset, base))
+    tmpl = rep.find(q("SegmentTemplate"), ns)
+    if tmpl is None:
+        tmpl = aset.find(q("SegmentTemplate"), ns)
+    if tmpl is None or not tmpl.get("media"):
+        raise ValueError("manifest does not use SegmentTemplate")
+
+    rep_id = rep.get("id") or ""
+    codecs = rep.get("codecs") or aset.get("codecs") or ""
+    bandwidth = rep.get("bandwidth") or "0"
+    media = tmpl.get("media")
+    number = int(tmpl.get("startNumber") or 1)
+    urls = []
+    if tmpl.get("initialization"):
+        urls.append(urljoin(base, _fill_template(tmpl.get("initialization"), rep_id, bandwidth)))
+
+    timeline = tmpl.find(q("SegmentTimeline"), ns)
+    if timeline is not None:
+        t = 0
+        for seg in timeline.findall(q("S"), ns):
+            t = int(seg.get("t", t))
+            if seg.get("d") is None:
+                raise ValueError("SegmentTimeline <S> without a duration")
+            d = int(seg.get("d"))
+            repeat = int(seg.get("r") or 0)
+            if repeat < 0:
+                raise ValueError("open-ended SegmentTimeline repeats are not supported")
+            for _ in range(repeat + 1):
+                urls.append(urljoin(base, _fill_template(media, rep_id, bandwidth, number, t)))
+                t += d
+                number += 1
+    else:
+        if "$Time" in media:
+            raise ValueError("$Time$ template without a SegmentTimeline")
+        total_seconds = parse_iso_duration(period.get("duration") or root.get("mediaPresentationDuration") or "")
+        seg_seconds = int(tmpl.get("duration") or 0) / int(tmpl.get("timescale") or 1)
+        if seg_seconds <= 0:
+            raise ValueError("SegmentTemplate has no duration")
+        for n in range(number, number + math.ceil(total_seconds / seg_seconds)):
+            urls.append(urljoin(base, _fill_template(media, rep_id, bandwidth, n)))
+    return urls, codecs
+
+def is_mp3_codec(codecs: str) -> bool:
+    # "mp4a.6B"/"mp4a.69" are the MPEG-1/2 Layer III object types inside MP4
+    return codecs.strip().lower() in MP3_CODECS
+
+def probe_audio_codec(url: str, referer: str) -> str:
+    """Ask ffprobe for the first audio stream's codec name; "" if ffprobe is missing or fails."""
+    if shutil.which("ffprobe") is None:
+        return ""
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-user_agent", UA,
+        "-headers", _ffmpeg_headers(referer),
+        "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name",
+        "-of", "csv=p=0",
+        url,
+    ]
+    try:
+        res = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return res.stdout.strip() if res.returncode == 0 else ""
+
+def _mp3_codec_args(source_is_mp3: bool) -> list[str]:
+    # MP3 sources are remuxed as-is; anything else is transcoded
+    if source_is_mp3:
+        return ["-c:a", "copy", "-f", "mp3"]
+    return ["-c:a", "libmp3lame", "-b:a", "192k"]
+
+def fetch_dash_audio(urls: list[str], sink, referer: str):
+    """
+    Download DASH segments concurrently and write them, in order, to the binary
+    file-like sink (init first, so the result is a playable fragmented MP4).
+    """
+    def fetch(url: str) -> bytes:
+        r = SESSION.get(url, headers={"Referer": referer}, timeout=60)
+        r.raise_for_status()
+        return r.content
+
+    executor = ThreadPoolExecutor(max_workers=SEGMENT_WORKERS)
+    try:
+        # Bounded window: a slow reader (ffmpeg encoding, or a later input of the single-pass
+        # concat waiting its turn) must not make us buffer the whole stream in memory
+        pending = deque()
+        url_iter = iter(urls)
+        for url in islice(url_iter, SEGMENT_WINDOW):
+            pending.append(executor.submit(fetch, url))
+        while pending:
+            data = pending.popleft().result()
+            for url in islice(url_iter, 1):
+                pending.append(executor.submit(fetch, url))
+            sink.write(data)
+    finally:
+        # On failure don't keep downloading segments nobody will read
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _ffmpeg_headers(referer: str) -> str:
+    return (
         "Origin: https://www.mujrozhlas.cz\r\n"
         f"Referer: {referer}\r\n"
         "Accept: */*\r\n"
@@ -87,80 +344,319 @@ def record_dash_to_mp3(mpd_url: str, out_path: Path, referer: str):
         "Pragma: no-cache\r\n"
         "Cache-Control: no-cache\r\n"
     )
+
+def _wait_ffmpeg(proc: subprocess.Popen, progress: bool = True):
+    spinner = "|/-\\"
+    # Redirected output (logs/CI) or several parts at once get no spinner, just the wait
+    if not progress or not sys.stdout.isatty():
+        proc.wait()
+        return
+    i = 0
+    start = time.time()
+    try:
+        while True:
+            elapsed = int(time.time() - start)
+            with PRINT_LOCK:
+                print(f"\r    Recording… {spinner[i % len(spinner)]}  Elapsed: {elapsed}s", end="", flush=True)
+            try:
+                proc.wait(timeout=1.0)
+                break
+            except subprocess.TimeoutExpired:
+                i += 1
+    finally:
+        with PRINT_LOCK:
+            print()
+
+def record_dash_to_mp3(mpd_url: str, out_path: Path, referer: str, progress: bool = True):
+    # Fetch the segments ourselves when possible and pipe them to ffmpeg, so it only transcodes
+    try:
+        segment_urls, codecs = dash_segment_urls(mpd_url, referer)
+    except (ValueError, ET.ParseError):
+        segment_urls, codecs = None, probe_audio_codec(mpd_url, referer)
+    if segment_urls:
+        src_args = ["-i", "pipe:0"]
+    else:
+        src_args = ["-nostdin", "-user_agent", UA, "-headers", _ffmpeg_headers(referer), "-i", mpd_url]
+    cmd = [
+        "ffmpeg",
+        *src_args,
+        "-vn",
+        *_mp3_codec_args(is_mp3_codec(codecs)),
+        "-y",
+        str(out_path),
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if segment_urls else None,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    if segment_urls:
+        with PRINT_LOCK:
+            print(f"    Fetching {len(segment_urls)} DASH segment(s) for {out_path.name}…")
+        try:
+            fetch_dash_audio(segment_urls, proc.stdin, referer)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its return code is checked below
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+    _wait_ffmpeg(proc, progress)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+def record_dash_concat_to_mp3(mpd_urls: list[str], out_path: Path, referer: str) -> bool:
+    """
+    Fetch, decode, concatenate and encode several DASH streams in a single ffmpeg pass,
+    without per-part files. Each stream's segments are fed through their own pipe (pipe:N).
+    Returns False when that isn't possible (non-POSIX, unsupported manifest), so the caller
+    can fall back to recording parts separately.
+    """
+    if os.name != "posix":
+        return False
+    try:
+        manifests = [dash_segment_urls(u, referer) for u in mpd_urls]
+    except (ValueError, ET.ParseError):
+        return False
+    segment_lists = [urls for urls, _ in manifests]
+    if not all(segment_lists):
+        return False
+    # The concat filter forces a decode; MP3 sources are cheaper remuxed per part and byte-joined
+    if all(is_mp3_codec(codecs) for _, codecs in manifests):
+        return False
+
+    pipes = [os.pipe() for _ in segment_lists]
+    n = len(pipes)
+    inputs = []
+    for rfd, _ in pipes:
+        inputs += ["-i", f"pipe:{rfd}"]
+    graph = "".join(f"[{i}:a]" for i in range(n)) + f"concat=n={n}:v=0:a=1[a]"
     cmd = [
         "ffmpeg",
         "-nostdin",
-        "-user_agent", UA,
-        "-headers", ffmpeg_headers,
-        "-i", mpd_url,
-        "-vn",
+        *inputs,
+        "-filter_complex", graph,
+        "-map", "[a]",
         "-c:a", "libmp3lame",
         "-b:a", "192k",
+        "-f", "mp3",
         "-y",
         str(out_path),
     ]
-    spinner = "|/-\\"
-    i = 0
-    start = time.time()
-    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     try:
-        while True:
-            ret = proc.poll()
-            elapsed = int(time.time() - start)
-            print(f"\r    Recording… {spinner[i % len(spinner)]}  Elapsed: {elapsed}s", end="", flush=True)
-            if ret is not None:
-                break
-            time.sleep(0.15)
-            i += 1
-    finally:
-        print()
+        proc = subprocess.Popen(
+            cmd,
+            pass_fds=[rfd for rfd, _ in pipes],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except BaseException:
+        for rfd, wfd in pipes:
+            os.close(rfd)
+            os.close(wfd)
+        raise
+    for rfd, _ in pipes:
+        os.close(rfd)
+
+    errors = []
+
+    def feed(urls: list[str], wfd: int):
+        try:
+            with open(wfd, "wb") as sink:
+                fetch_dash_audio(urls, sink, referer)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its return code is checked below
+        except BaseException as e:
+            errors.append(e)
+            # A truncated input would otherwise still produce a "successful" merge
+            proc.kill()
+
+    total_segments = sum(len(urls) for urls in segment_lists)
+    print(f"    Fetching {total_segments} DASH segment(s) from {n} stream(s)…")
+    feeders = [
+        threading.Thread(target=feed, args=(urls, wfd), daemon=True)
+        for urls, (_, wfd) in zip(segment_lists, pipes)
+    ]
+    for t in feeders:
+        t.start()
+    _wait_ffmpeg(proc)
+    for t in feeders:
+        t.join()
+    if errors:
+        raise errors[0]
     if proc.returncode != 0:
         raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return True
 
-def download_mp3(url: str, out_path: Path, referer: str):
-    headers = dict(HEADERS)
-    headers["Referer"] = referer
+DOWNLOAD_CHUNK = 1 << 20
+# Refresh the progress line every 4 MiB rather than on every chunk
+PROGRESS_STEP = 1 << 22
+
+def download_mp3(url: str, out_path: Path, referer: str, progress: bool = True):
     start = time.time()
-    last_print = 0.0
     bytes_done = 0
+    next_print = PROGRESS_STEP
     human = lambda b: f"{b/1024/1024:.2f} MB"
-    with requests.get(url, headers=headers, stream=True, timeout=60) as r:
+    with SESSION.get(url, headers={"Referer": referer}, stream=True, timeout=60) as r:
         r.raise_for_status()
         total = int(r.headers.get("Content-Length") or 0)
-        with open(out_path, "wb") as f:
-            for chunk in r.iter_content(256 * 1024):
-                if not chunk:
-                    continue
-                f.write(chunk)
-                bytes_done += len(chunk)
-                now = time.time()
-                if now - last_print >= 0.1:
-                    elapsed = max(now - start, 1e-6)
-                    speed = bytes_done / elapsed
-                    if total > 0:
+        # Buffer matches the chunk size, so each chunk goes out as a single write(2)
+        with open(out_path, "wb", buffering=DOWNLOAD_CHUNK) as f:
+            if total <= 0 or not progress:
+                # No size to report progress against (or no progress wanted); let the copy loop stay in C
+                r.raw.decode_content = True
+                shutil.copyfileobj(r.raw, f, length=DOWNLOAD_CHUNK)
+                bytes_done = f.tell()
+                if progress:
+                    with PRINT_LOCK:
+                        print(f"\r    {human(bytes_done)} downloaded", end="", flush=True)
+            else:
+                for chunk in r.iter_content(DOWNLOAD_CHUNK):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    bytes_done += len(chunk)
+                    if bytes_done >= next_print or bytes_done >= total:
+                        next_print = bytes_done + PROGRESS_STEP
+                        elapsed = max(time.time() - start, 1e-6)
+                        speed = bytes_done / elapsed
                         pct = bytes_done / total * 100
                         remaining = max(total - bytes_done, 0)
                         eta = remaining / max(speed, 1e-6)
-                        print(
+                        line = (
                             f"\r    {pct:6.2f}%  ({human(bytes_done)}/{human(total)})  "
-                            f"{speed/1024/1024:.2f} MB/s  ETA {int(eta)}s",
-                            end="", flush=True
-                        )
-                    else:
-                        print(
-                            f"\r    {human(bytes_done)} downloaded  "
-                            f"{speed/1024/1024:.2f} MB/s",
-                            end="", flush=True
+                            f"{speed/1024/1024:.2f} MB/s  ETA {int(eta)}s"
                         )
-                    last_print = now
-    print()
+                        with PRINT_LOCK:
+                            print(line, end="", flush=True)
+    if progress:
+        with PRINT_LOCK:
+            print()
+
+# Layer III bitrates (kbps) by bitrate index, for MPEG-1 and MPEG-2/2.5
+MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by the header's version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def _parse_mp3_header(h: bytes):
+    """Return (sample_rate, channels, bitrate, frame_length, version) for a Layer III frame header, else None."""
+    if len(h) < 4 or h[0] != 0xFF or (h[1] & 0xE0) != 0xE0:
+        return None
+    version, layer = (h[1] >> 3) & 3, (h[1] >> 1) & 3
+    br_idx, sr_idx = h[2] >> 4, (h[2] >> 2) & 3
+    if version == 1 or layer != 1 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    sample_rate = MP3_SAMPLE_RATES[version][sr_idx]
+    bitrate = MP3_BITRATES[1 if version == 3 else 2][br_idx] * 1000
+    length = (144 if version == 3 else 72) * bitrate // sample_rate + ((h[2] >> 1) & 1)
+    channels = 1 if (h[3] >> 6) == 3 else 2
+    return sample_rate, channels, bitrate, length, version
+
+def _mp3_audio_span(path) -> tuple[int, int, tuple, bool] | None:
+    """
+    Locate the MPEG audio frames of an MP3 file, skipping ID3v2/ID3v1 tags and a leading
+    Xing/Info/VBRI header frame. Returns (start, end, (sample_rate, channels, bitrate), vbr),
+    where vbr is True for a Xing/VBRI tag (Info marks CBR), or None if no Layer III frame is found.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        start = 0
+        head = f.read(10)
+        if head[:3] == b"ID3" and len(head) == 10:
+            tag_size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+            start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        f.seek(start)
+        buf = f.read(64 * 1024)
+        end = size
+        if size - start >= 128:
+            f.seek(size - 128)
+            if f.read(3) == b"TAG":
+                end = size - 128
+
+    # Accept a frame sync only if the following frame header is valid too
+    for i in range(max(len(buf) - 4, 0)):
+        info = _parse_mp3_header(buf[i:i + 4])
+        if info is None:
+            continue
+        sample_rate, channels, bitrate, length, version = info
+        nxt = buf[i + length:i + length + 4]
+        if len(nxt) == 4 and _parse_mp3_header(nxt) is None:
+            continue
+        break
+    else:
+        return None
+
+    frame = buf[i:i + length]
+    side_info = (32 if channels == 2 else 17) if version == 3 else (17 if channels == 2 else 9)
+    tag = frame[4 + side_info:8 + side_info]
+    vbr = tag == b"Xing" or frame[36:40] == b"VBRI"
+    if vbr or tag == b"Info":
+        # Tag frame describes only this part; drop it so it can't mislabel the merged file
+        i += length
+        nxt = _parse_mp3_header(buf[i:i + 4])
+        if nxt is not None:
+            sample_rate, channels, bitrate = nxt[:3]
+    return start + i, end, (sample_rate, channels, bitrate), vbr
+
+def _copy_range(src, dst, start: int, end: int):
+    if sys.platform.startswith("linux"):
+        # sendfile(2) to a regular file is Linux-only; elsewhere it requires a socket
+        offset = start
+        # Anything still in dst's buffer must reach the fd before sendfile appends after it
+        dst.flush()
+        try:
+            while offset < end:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, end - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            dst.seek(0, os.SEEK_END)
+            return
+        except OSError:
+            dst.seek(0, os.SEEK_END)
+            start = offset
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(DOWNLOAD_CHUNK, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+def _raw_concat(parts, spans, output_file: Path):
+    """
+    Byte-concatenate the audio frames of MP3 parts. MPEG audio frames are self-synchronizing,
+    so no remux is needed; on Linux os.sendfile keeps the copy in the kernel.
+    """
+    with open(output_file, "wb") as dst:
+        for p, (start, end, _, _) in zip(parts, spans):
+            with open(p, "rb") as src:
+                _copy_range(src, dst, start, end)
 
 def concat_mp3(parts, output_file: Path):
+    if len(parts) == 1:
+        # Nothing to merge; keep the file as-is, tags and VBR header included
+        shutil.copyfile(parts[0], output_file)
+        return
+    # Byte-join only CBR bitstreams with identical parameters. VBR parts (Xing/VBRI tag) and
+    # anything else go through ffmpeg, which writes a correct Xing header for the merged file.
+    spans = [_mp3_audio_span(p) for p in parts]
+    if all(spans) and not any(span[3] for span in spans) and len({span[2] for span in spans}) == 1:
+        _raw_concat(parts, spans, output_file)
+        return
     with tempfile.TemporaryDirectory() as td:
         list_file = Path(td) / "list.txt"
-        with open(list_file, "w", encoding="utf-8") as lf:
-            for p in parts:
-                lf.write(f"file '{Path(p).as_posix()}'\n")
+        list_file.write_text("".join(f"file '{Path(p).as_posix()}'\n" for p in parts), encoding="utf-8")
         cmd = [
             "ffmpeg",
             "-loglevel", "error",
@@ -176,10 +672,122 @@ def concat_mp3(parts, output_file: Path):
 
 def host_of(url: str) -> str:
     try:
-        return urlparse(url).hostname or ""
+        return _parse_url(url).hostname or ""
     except Exception:
         return ""
 
+def collect_streams_from_html(page_url: str) -> list[str]:
+    """
+    Cheap first attempt: fetch the page once and look for croaod.cz .mpd/.mp3 (or .m4s -> infer .mpd)
+    URLs in its markup. Returns [] when nothing is found, so the caller can fall back to Playwright.
+    """
+    try:
+        r = SESSION.get(page_url, headers={"Accept": "text/html,*/*"}, timeout=10)
+        r.raise_for_status()
+    except requests.RequestException:
+        return []
+    text = r.text
+    if "croaod.cz" not in text:
+        return []
+    # URLs inside inline JSON come with escaped slashes
+    text = text.replace("\\/", "/")
+    mpds = []
+    mp3s = []
+    manifest_candidates = []
+    for url in dict.fromkeys(PAGE_STREAM_RE.findall(text)):
+        url = url.replace("&amp;", "&")
+        if not CRO_HOST_RE.search(host_of(url)):
+            continue
+        if M4S_RE.search(url):
+            mpd_guess = segment_to_manifest_url(url)
+            if mpd_guess and mpd_guess not in manifest_candidates:
+                manifest_candidates.append(mpd_guess)
+        elif MPD_RE.search(url):
+            mpds.append(url)
+        else:
+            mp3s.append(url)
+    # Player configs may list the same episode as both DASH and MP3; taking both would
+    # merge the audio twice, so keep a single format (DASH first)
+    return mpds or mp3s or manifest_candidates
+
+def is_stream_request(req) -> bool:
+    return bool(CRO_HOST_RE.search(host_of(req.url) or "")) and bool(MPD_RE.search(req.url) or MP3_RE.search(req.url))
+
+def wait_for_stream_request(page, timeout_ms: int = STREAM_WAIT_MS):
+    """
+    Block until the page requests a croaod.cz .mpd/.mp3, or until timeout_ms passes.
+    .m4s traffic from a part that is already playing doesn't count.
+    """
+    try:
+        page.wait_for_event(
+            "request",
+            predicate=is_stream_request,
+            timeout=timeout_ms,
+        )
+    except PlaywrightTimeoutError:
+        pass
+
+@lru_cache(maxsize=1)
+def _pw_browser():
+    """Start Playwright and Chromium once per process; later sniffs only open a new context."""
+    pw = sync_playwright().start()
+    try:
+        browser = pw.chromium.launch(
+            headless=True,
+            args=["--lang=cs", "--autoplay-policy=no-user-gesture-required"]
+        )
+    except BaseException:
+        # e.g. Chromium not installed; don't leave the Playwright driver running
+        pw.stop()
+        raise
+
+    def _shutdown():
+        try:
+            browser.close()
+        finally:
+            pw.stop()
+
+    atexit.register(_shutdown)
+    return pw, browser
+
+def block_heavy_resources(route):
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES and not CRO_HOST_RE.search(host_of(req.url) or ""):
+        route.abort()
+    else:
+        route.continue_()
+
+def accept_cookies(page):
+    # The consent banner is usually appended at the end of <body>, so an earlier (possibly hidden)
+    # match must not stop us: try visible matches in order until one click succeeds
+    try:
+        buttons = page.locator(COOKIE_SELECTOR).all()
+    except Exception:
+        return
+    for btn in buttons:
+        try:
+            if not btn.is_visible():
+                continue
+            btn.scroll_into_view_if_needed(timeout=1000)
+            btn.click(timeout=1500)
+        except Exception:
+            continue
+        wait_for_stream_request(page, 600)
+        return
+
+def click_play_buttons(page):
+    try:
+        buttons = page.locator(PLAY_SELECTOR).all()
+    except Exception:
+        return
+    for e in buttons:
+        try:
+            e.scroll_into_view_if_needed(timeout=1000)
+            e.click(timeout=1200)
+            wait_for_stream_request(page)
+        except Exception:
+            continue
+
 def collect_streams_with_playwright(page_url: str, dwell_seconds: int = 10) -> list[str]:
     """
     Attempts to auto-discover croaod.cz .mpd/.mp3 (or .m4s -> infer .mpd) from a mujrozhlas.cz page.
@@ -188,29 +796,33 @@ def collect_streams_with_playwright(page_url: str, dwell_seconds: int = 10) -> l
     streams = []
     seen = set()
     manifest_candidates = set()
+    found = threading.Event()
 
     def maybe_add(url: str):
-        if not url or url in seen:
+        # Fires for every request/response; reject the common case with a plain substring test
+        if not url or "croaod.cz" not in url or url in seen:
             return
-        h = host_of(url) or ""
-        if CRO_HOST_RE.search(h) and (MPD_RE.search(url) or MP3_RE.search(url) or M4S_RE.search(url)):
-            if M4S_RE.search(url):
-                mpd_guess = segment_to_manifest_url(url)
-                if mpd_guess:
-                    manifest_candidates.add(mpd_guess)
-            seen.add(url)
-            streams.append(url)
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=["--lang=cs", "--autoplay-policy=no-user-gesture-required"]
-        )
-        ctx = browser.new_context(
-            user_agent=UA,
-            locale="cs-CZ",
-            extra_http_headers={"Accept-Language": "cs,en-US;q=0.7,en;q=0.3"},
-        )
+        m = STREAM_RE.search(url)
+        if m is None or not CRO_HOST_RE.search(host_of(url)):
+            return
+        if m.group(1).lower() == "m4s":
+            mpd_guess = segment_to_manifest_url(url)
+            if mpd_guess:
+                manifest_candidates.add(mpd_guess)
+        else:
+            found.set()
+        seen.add(url)
+        streams.append(url)
+
+    _, browser = _pw_browser()
+    ctx = browser.new_context(
+        user_agent=UA,
+        locale="cs-CZ",
+        extra_http_headers={"Accept-Language": "cs,en-US;q=0.7,en;q=0.3"},
+    )
+    try:
+        # Skip images/fonts/media/CSS; XHR, fetch, documents and scripts still load so the player runs
+        ctx.route("**/*", block_heavy_resources)
 
         # Listen on CONTEXT to also catch service worker traffic
         ctx.on("request", lambda req: maybe_add(req.url))
@@ -221,58 +833,29 @@ def collect_streams_with_playwright(page_url: str, dwell_seconds: int = 10) -> l
         page.wait_for_timeout(800)
         page.goto(page_url, wait_until="domcontentloaded")
 
-        # Try cookie/consent
+        # Returns as soon as a manifest/MP3 request fires, instead of a fixed dwell afterwards.
+        # If one was already captured during navigation there is nothing to wait for.
+        waiter = nullcontext() if found.is_set() else page.expect_request(is_stream_request, timeout=dwell_seconds * 1000)
         try:
-            for sel in COOKIE_SELECTORS:
-                try:
-                    btns = page.locator(sel)
-                    if btns.count() > 0:
-                        btns.first.scroll_into_view_if_needed(timeout=1000)
-                        btns.first.click(timeout=1500)
-                        page.wait_for_timeout(600)
-                except Exception:
-                    continue
-        except Exception:
-            pass
+            with waiter:
+                # Try cookie/consent
+                accept_cookies(page)
 
-        # Try clicking play buttons
-        for sel in PLAY_SELECTORS:
-            try:
-                for e in page.locator(sel).all():
-                    try:
-                        e.scroll_into_view_if_needed(timeout=1000)
-                        e.click(timeout=1200)
-                        page.wait_for_timeout(900)
-                    except Exception:
-                        continue
-            except Exception:
-                continue
+                # Try clicking play buttons
+                click_play_buttons(page)
+        except PlaywrightTimeoutError:
+            pass
 
-        # Wait & lazy players
-        page.wait_for_timeout(dwell_seconds * 1000)
-        last_h = page.evaluate("document.body.scrollHeight")
-        while True:
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(1200)
-            for sel in PLAY_SELECTORS:
-                try:
-                    for e in page.locator(sel).all():
-                        try:
-                            e.scroll_into_view_if_needed(timeout=1000)
-                            e.click(timeout=1200)
-                            page.wait_for_timeout(700)
-                        except Exception:
-                            continue
-                except Exception:
-                    continue
-            new_h = page.evaluate("document.body.scrollHeight")
-            if new_h == last_h:
-                break
-            last_h = new_h
+        # Lazy players: scroll to the bottom in one in-page call, then try their play buttons
+        if not found.is_set():
+            page.evaluate(SCROLL_TO_BOTTOM_JS)
+            if not found.is_set():
+                click_play_buttons(page)
 
+        # Settle so the manifest request of the last clicked part can still arrive before closing
         page.wait_for_timeout(1500)
+    finally:
         ctx.close()
-        browser.close()
 
     # Prefer MPD/MP3; if missing and we saw segments, return inferred MPDs
     mpd_or_mp3 = [u for u in streams if MPD_RE.search(u) or MP3_RE.search(u)]
@@ -295,8 +878,8 @@ def resolve_input_url(user_url: str) -> list[str]:
             mpd = segment_to_manifest_url(user_url)
             return [mpd] if mpd else []
         return [user_url]  # .mpd or .mp3
-    # Assume mujrozhlas.cz page; attempt to sniff
-    return collect_streams_with_playwright(user_url)
+    # Assume mujrozhlas.cz page; look in the HTML first, then attempt to sniff
+    return collect_streams_from_html(user_url) or collect_streams_with_playwright(user_url)
 
 def main():
     ap = argparse.ArgumentParser(
@@ -333,40 +916,83 @@ def main():
     for i, u in enumerate(stream_urls[:6], start=1):
         print(f"  [{i}] {u}")
 
+    total = len(stream_urls)
+    final_name = args.output or filename_from_url(args.url)
+    final_path = Path.cwd() / final_name
+
+    # Classify each URL once; reused for the fused-path check, pool choice and _process_one
+    mp3_flags = [bool(MP3_RE.search(u)) for u in stream_urls]
+
+    # Several DASH parts and no parts to keep: record them straight into the final file
+    if total > 1 and not args.keep_parts and not any(mp3_flags):
+        print(f"\nRecording {total} DASH stream(s) in one pass into: {final_path.name}")
+        # Record next to the target and rename on success, so a failed or interrupted pass
+        # neither leaves a truncated file behind nor clobbers an existing output
+        partial_path = final_path.with_name(final_path.name + ".part")
+        fused = False
+        try:
+            fused = record_dash_concat_to_mp3(stream_urls, partial_path, referer=args.url)
+        except (subprocess.CalledProcessError, requests.RequestException) as e:
+            print(f"  Single-pass recording failed: {e}; recording parts separately.")
+        finally:
+            if fused:
+                os.replace(partial_path, final_path)
+            else:
+                partial_path.unlink(missing_ok=True)
+        if fused:
+            print(f"\nDone.\nOutput: {final_path.resolve()}")
+            return
+
     tempdir = Path(tempfile.mkdtemp(prefix="mujrozhlas_parts_"))
-    parts = []
-    print(f"\nProcessing {len(stream_urls)} stream(s)…")
-    for idx, u in enumerate(stream_urls, start=1):
-        kind = "MP3" if MP3_RE.search(u) else ("DASH" if MPD_RE.search(u) else ("SEGMENT" if M4S_RE.search(u) else "UNKNOWN"))
-        print(f"\n[{idx}/{len(stream_urls)}] {kind}")
+    # Unlabeled "\r" progress/spinner lines only make sense while a single part is running
+    show_progress = total == 1
+
+    def _process_one(idx: int, u: str, is_mp3: bool):
+        kind = "MP3" if is_mp3 else ("DASH" if MPD_RE.search(u) else ("SEGMENT" if M4S_RE.search(u) else "UNKNOWN"))
         out_path = tempdir / f"{idx:02d} part.mp3"
         try:
-            if MP3_RE.search(u):
-                print(f"[{idx}] Downloading MP3…")
-                download_mp3(u, out_path, referer=args.url)
+            if is_mp3:
+                with PRINT_LOCK:
+                    print(f"\n[{idx}/{total}] {kind}\n[{idx}] Downloading MP3…")
+                download_mp3(u, out_path, referer=args.url, progress=show_progress)
             else:
                 # For .mpd or inferred from .m4s
-                print(f"[{idx}] Recording DASH via ffmpeg…")
-                record_dash_to_mp3(u, out_path, referer=args.url)
+                with PRINT_LOCK:
+                    print(f"\n[{idx}/{total}] {kind}\n[{idx}] Recording DASH via ffmpeg…")
+                record_dash_to_mp3(u, out_path, referer=args.url, progress=show_progress)
         except subprocess.CalledProcessError as e:
-            print(f"  ffmpeg failed: {e}; skipping this URL.")
-            continue
-        except requests.HTTPError as e:
-            print(f"  HTTP error: {e}; skipping this URL.")
-            continue
+            with PRINT_LOCK:
+                print(f"  [{idx}] ffmpeg failed: {e}; skipping this URL.")
+            return idx, None
+        except requests.RequestException as e:
+            with PRINT_LOCK:
+                print(f"  [{idx}] Download error: {e}; skipping this URL.")
+            return idx, None
 
         if out_path.exists() and out_path.stat().st_size > 1024:
-            parts.append(out_path)
-            print(f"  Saved: {out_path.name}")
-        else:
-            print("  Output missing/too small; skipping.")
+            with PRINT_LOCK:
+                print(f"  [{idx}] Saved: {out_path.name}")
+            return idx, out_path
+        with PRINT_LOCK:
+            print(f"  [{idx}] Output missing/too small; skipping.")
+        return idx, None
+
+    print(f"\nProcessing {total} stream(s)…")
+    # MP3 parts are pure network transfers, so they get as many workers as the HTTP pool has
+    # connections; DASH parts run an ffmpeg encode each and stay capped by the CPU count.
+    with ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE) as mp3_pool, \
+            ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as dash_pool:
+        futures = [
+            (mp3_pool if is_mp3 else dash_pool).submit(_process_one, idx, u, is_mp3)
+            for idx, (u, is_mp3) in enumerate(zip(stream_urls, mp3_flags), start=1)
+        ]
+        results = [f.result() for f in futures]
+    # Keep chapter order regardless of completion order
+    parts = [out for _, out in sorted(results, key=lambda r: r[0]) if out is not None]
 
     if not parts:
         die("No parts downloaded/recorded successfully.")
 
-    final_name = args.output or filename_from_url(args.url)
-    final_path = Path.cwd() / final_name
-
     print(f"\nMerging {len(parts)} part(s) into: {final_path.name}")
     concat_mp3(parts, final_path)
     print("Merge complete.")